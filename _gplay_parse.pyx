@@ -0,0 +1,132 @@
+# cython: language_level=3
+"""
+Compiled response walkers and app parser for gplay_mobile_search.
+
+Same behavior as _py_walk_app_items / _py_next_page_url / _py_parse_app there.
+Build in place and check parity with:
+    pip install cython pytest
+    cythonize -i _gplay_parse.pyx
+    pytest
+"""
+
+
+def walk_app_items(object data):
+    """Yield raw app items from search response, in response order"""
+    cdef object doc, cluster, app, sub_items, cluster_apps
+
+    for doc in data:
+        if not isinstance(doc, dict):
+            continue
+
+        # Apps can be in subItem
+        sub_items = (<dict>doc).get("subItem")
+        if sub_items:
+            for cluster in sub_items:
+                if not isinstance(cluster, dict):
+                    continue
+
+                # Apps in cluster's subItem
+                cluster_apps = (<dict>cluster).get("subItem")
+                if not cluster_apps:
+                    continue
+                for app in cluster_apps:
+                    if isinstance(app, dict) and (<dict>app).get("id"):
+                        yield app
+
+        # Or directly as an app
+        elif (<dict>doc).get("id"):
+            yield doc
+
+
+cpdef object next_page_url(object data):
+    """Find nextPageUrl in search response (last one wins)"""
+    cdef object next_url = None
+    cdef object doc, cluster, url, sub_items
+
+    for doc in data:
+        if not isinstance(doc, dict):
+            continue
+
+        # Check for nextPageUrl in containerMetadata
+        try:
+            url = (<dict>doc)["containerMetadata"]["nextPageUrl"]
+        except KeyError:
+            pass
+        else:
+            if url:
+                next_url = url
+
+        sub_items = (<dict>doc).get("subItem")
+        if not sub_items:
+            continue
+
+        for cluster in sub_items:
+            if not isinstance(cluster, dict):
+                continue
+
+            # Check for nextPageUrl in cluster
+            try:
+                url = (<dict>cluster)["containerMetadata"]["nextPageUrl"]
+            except KeyError:
+                continue
+            if url:
+                next_url = url
+
+    return next_url
+
+
+cpdef tuple parse_app(dict item, object fields=None):
+    """Extract AppInfo field values from a mobile API app item, in AppInfo field order"""
+    cdef object app_id, title = "", score = None, developer = None
+    cdef object developer_id = None, icon = None, installs = None, summary = None
+    cdef object details, dev_email, img, offer, first_offer
+    cdef object price = 0.0
+    cdef bint free = True
+    cdef bint all_fields = fields is None
+
+    app_id = item.get("id") or item.get("docid") or ""
+
+    if all_fields or "title" in fields:
+        title = item.get("title", "")
+
+    # Details can be in various places
+    if all_fields or not fields.isdisjoint(("developer", "developerId", "installs")):
+        details = (item.get("details") or {}).get("appDetails")
+        if details:
+            developer = details.get("developerName")
+            installs = details.get("numDownloads")
+            dev_email = details.get("developerEmail")
+            if dev_email:
+                developer_id = dev_email.partition("@")[0]
+
+    # Aggregate rating
+    if all_fields or "score" in fields:
+        score = (item.get("aggregateRating") or {}).get("starRating")
+
+    # Images (type 4 is the app icon)
+    if all_fields or "icon" in fields:
+        for img in item.get("image") or ():
+            if img.get("imageType") == 4:
+                icon = img.get("imageUrl")
+                break
+
+    # Offer (price)
+    if all_fields or "price" in fields or "free" in fields:
+        offer = item.get("offer")
+        if offer:
+            first_offer = offer[0] if isinstance(offer, list) else offer
+            if isinstance(first_offer, dict):
+                try:
+                    price = int((<dict>first_offer).get("micros", 0)) / 1_000_000
+                except (TypeError, ValueError):
+                    price = 0.0
+                free = price == 0
+
+    # Description snippet
+    if all_fields or "summary" in fields:
+        if "descriptionHtml" in item:
+            summary = item["descriptionHtml"][:200]
+        elif "descriptionShort" in item:
+            summary = item["descriptionShort"]
+
+    return (app_id, title, score, developer, developer_id, icon, installs, price, "USD", free, summary)
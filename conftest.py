@@ -0,0 +1 @@
+# Keeps the repo root importable so plain `pytest` finds gplay_mobile_search
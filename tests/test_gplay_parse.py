@@ -0,0 +1,151 @@
+"""Response parsing: pure-Python walkers/parser and parity with compiled _gplay_parse"""
+
+import random
+
+import pytest
+
+import gplay_mobile_search as gms
+
+
+@pytest.fixture(scope="module")
+def compiled():
+    return pytest.importorskip("_gplay_parse")
+
+
+def _random_node(rng, depth, counter):
+    if rng.random() < 0.1:
+        return rng.choice([None, 3, "text", []])
+    
+    counter[0] += 1
+    node = {}
+    if rng.random() < 0.6:
+        node["id"] = rng.choice([f"app{counter[0]}", ""])
+    if rng.random() < 0.4:
+        node["containerMetadata"] = rng.choice(
+            [{}, {"nextPageUrl": f"page{counter[0]}"}, {"nextPageUrl": ""}]
+        )
+    if depth < 3 and rng.random() < 0.5:
+        node["subItem"] = [_random_node(rng, depth + 1, counter) for _ in range(rng.randint(0, 4))]
+    return node
+
+
+def _random_responses(count=2000, seed=1234):
+    rng = random.Random(seed)
+    counter = [0]
+    for _ in range(count):
+        yield [_random_node(rng, 0, counter) for _ in range(rng.randint(0, 4))]
+
+
+def _random_app(rng, n):
+    item = {}
+    if rng.random() < 0.9:
+        item["id"] = f"com.example.app{n}"
+    if rng.random() < 0.2:
+        item["docid"] = f"docid{n}"
+    if rng.random() < 0.9:
+        item["title"] = f"App {n}"
+    if rng.random() < 0.7:
+        item["details"] = rng.choice([
+            {},
+            {"appDetails": {}},
+            {"appDetails": {
+                "developerName": f"Dev {n}",
+                "numDownloads": "1,000+",
+                "developerEmail": rng.choice([f"dev{n}@example.com", "", "nodomain"]),
+            }},
+        ])
+    if rng.random() < 0.7:
+        item["aggregateRating"] = rng.choice([{}, {"starRating": rng.random() * 5}])
+    if rng.random() < 0.7:
+        item["image"] = [
+            {"imageType": rng.choice([1, 2, 4]), "imageUrl": f"https://img/{n}/{i}"}
+            for i in range(rng.randint(0, 4))
+        ]
+    if rng.random() < 0.7:
+        offer = rng.choice([
+            {"micros": rng.choice([0, 990000, "1990000", "bad", None])},
+            {},
+            "junk",
+        ])
+        item["offer"] = rng.choice([[offer], offer, []])
+    if rng.random() < 0.3:
+        item["descriptionHtml"] = "x" * rng.randint(0, 300)
+    if rng.random() < 0.3:
+        item["descriptionShort"] = f"Short {n}"
+    return item
+
+
+def _random_apps(count=2000, seed=1234):
+    rng = random.Random(seed)
+    return [_random_app(rng, n) for n in range(count)]
+
+
+FIELD_SETS = [
+    None,
+    frozenset({"appId"}),
+    frozenset({"appId", "title", "score"}),
+    frozenset({"appId", "developerId", "icon", "free"}),
+    frozenset({"appId", "installs", "price", "summary"}),
+]
+
+
+def test_py_walk_app_items_order():
+    data = [
+        {"id": "direct"},
+        {"subItem": [{"subItem": [{"id": "a"}, {"id": ""}, "junk", {"id": "b"}]}, None]},
+        {"containerMetadata": {"nextPageUrl": "next"}},
+    ]
+    assert [item["id"] for item in gms._py_walk_app_items(data)] == ["direct", "a", "b"]
+    assert gms._py_next_page_url(data) == "next"
+
+
+def test_py_parse_app():
+    item = {
+        "id": "com.example",
+        "title": "Example",
+        "details": {"appDetails": {
+            "developerName": "Dev",
+            "numDownloads": "10+",
+            "developerEmail": "dev@example.com",
+        }},
+        "aggregateRating": {"starRating": 4.5},
+        "image": [{"imageType": 2, "imageUrl": "shot"}, {"imageType": 4, "imageUrl": "icon"}],
+        "offer": [{"micros": "1990000"}],
+        "descriptionShort": "Short",
+    }
+    assert gms._py_parse_app(item) == (
+        "com.example", "Example", 4.5, "Dev", "dev", "icon", "10+", 1.99, "USD", False, "Short",
+    )
+    assert gms._py_parse_app(item, frozenset({"appId", "score"})) == (
+        "com.example", "", 4.5, None, None, None, None, 0.0, "USD", True, None,
+    )
+
+
+def test_walk_app_items_matches_python(compiled):
+    for data in _random_responses():
+        assert list(compiled.walk_app_items(data)) == list(gms._py_walk_app_items(data))
+
+
+def test_next_page_url_matches_python(compiled):
+    for data in _random_responses():
+        assert compiled.next_page_url(data) == gms._py_next_page_url(data)
+
+
+def test_parse_app_matches_python(compiled):
+    for item in _random_apps():
+        for fields in FIELD_SETS:
+            assert compiled.parse_app(item, fields) == gms._py_parse_app(item, fields)
+
+
+def test_walk_app_items_is_lazy(compiled):
+    data = [{"id": "first"}, {"id": "second"}]
+    items = compiled.walk_app_items(data)
+    assert next(items) == {"id": "first"}
+    data.append({"id": "third"})
+    assert [item["id"] for item in items] == ["second", "third"]
+
+
+def test_compiled_parser_is_used(compiled):
+    assert gms._walk_app_items is compiled.walk_app_items
+    assert gms._next_page_url is compiled.next_page_url
+    assert gms._parse_app is compiled.parse_app
@@ -0,0 +1,196 @@
+"""Search caching, lazy login and rate limiter bounds, against a stub playstoreapi"""
+
+import os
+import sqlite3
+import sys
+import types
+
+import pytest
+
+import gplay_mobile_search as gms
+
+PAGES = 5
+APPS_PER_PAGE = 10
+
+
+def _page(number):
+    apps = [{"id": f"app{number}_{i}", "title": f"App {number}.{i}"} for i in range(APPS_PER_PAGE)]
+    cluster = {"subItem": apps}
+    if number + 1 < PAGES:
+        cluster["containerMetadata"] = {"nextPageUrl": f"page{number + 1}"}
+    return [{"subItem": [cluster]}]
+
+
+class FakeGooglePlayAPI:
+    """Records calls instead of talking to Google Play"""
+    
+    def __init__(self, **kwargs):
+        self.calls = []
+        self.gsfId = 1
+        self.authSubToken = "token"
+        self.deviceCheckinConsistencyToken = None
+        self.deviceConfigToken = None
+        self.dfeCookie = None
+    
+    def setLocale(self, locale):
+        pass
+    
+    def login(self, **kwargs):
+        self.calls.append(("login", kwargs))
+        if kwargs.get("anonymous"):
+            self.authSubToken = f"token{self.count('login')}"
+    
+    def search(self, query=None, nextPageUrl=None):
+        self.calls.append(("search", nextPageUrl or query))
+        return _page(int(nextPageUrl[len("page"):]) if nextPageUrl else 0)
+    
+    def count(self, name):
+        return sum(1 for call in self.calls if call[0] == name)
+
+
+@pytest.fixture
+def make_api(tmp_path, monkeypatch):
+    package = types.ModuleType("playstoreapi")
+    googleplay = types.ModuleType("playstoreapi.googleplay")
+    googleplay.GooglePlayAPI = FakeGooglePlayAPI
+    package.googleplay = googleplay
+    monkeypatch.setitem(sys.modules, "playstoreapi", package)
+    monkeypatch.setitem(sys.modules, "playstoreapi.googleplay", googleplay)
+    monkeypatch.setattr(gms.MobilePlayAPI, "CACHE_PATH", str(tmp_path / "cache" / "responses.sqlite"))
+    monkeypatch.setattr(gms.MobilePlayAPI, "CONFIG_PATH", str(tmp_path / "config" / "gplay.json"))
+    
+    apis = []
+    
+    def make(**kwargs):
+        api = gms.MobilePlayAPI(**kwargs)
+        api._bucket = gms.TokenBucket(rate=1000.0, capacity=1000)
+        apis.append(api)
+        return api
+    
+    yield make
+    for api in apis:
+        api.close()
+
+
+def test_cached_search_makes_no_requests(make_api):
+    first = make_api()
+    results = first.search("vpn", n_hits=25)
+    first.close()
+    assert len(results) == 25
+    
+    second = make_api()
+    assert second.search("vpn", n_hits=25) == results
+    assert second.api.calls == []
+    assert not second._logged_in
+
+
+def test_no_prefetch_past_cached_page(make_api):
+    api = make_api()
+    # Only the first page is cached
+    api._store(gms.ResponseCache.make_key("search_page", "vpn", "en", "us", None), _page(0))
+    
+    # A cancelled prefetch makes no request, so record submissions instead
+    submitted = []
+    submit = api._prefetch_pool.submit
+    api._prefetch_pool.submit = lambda *args: submitted.append(args) or submit(*args)
+    
+    results = api.search("vpn", n_hits=APPS_PER_PAGE)
+    api.close()
+    assert [app["appId"] for app in results] == [f"app0_{i}" for i in range(APPS_PER_PAGE)]
+    assert submitted == []
+    assert api.api.calls == []
+
+
+def test_bypass_cache_fetches_again(make_api):
+    first = make_api()
+    first.search("vpn", n_hits=5)
+    first.close()
+    
+    second = make_api()
+    second.search("vpn", n_hits=5, bypass_cache=True)
+    assert second.api.count("search") >= 1
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"{status_code} error")
+        self.response = types.SimpleNamespace(status_code=status_code, headers={})
+
+
+def test_revoked_token_relogs_in_once(make_api):
+    api = make_api(cache_ttl=0)
+    search = api.api.search
+    
+    def revoked_once(**kwargs):
+        if api.api.authSubToken == "token1":
+            raise HTTPError(401)
+        return search(**kwargs)
+    
+    api.api.search = revoked_once
+    assert len(api.search("vpn", n_hits=5)) == 5
+    assert [call[1] for call in api.api.calls if call[0] == "login"] == [
+        {"anonymous": True},
+        {"anonymous": True},
+    ]
+
+
+def test_search_many_runs_duplicate_queries_once(make_api):
+    api = make_api(cache_ttl=0)
+    results = api.search_many(["vpn", "vpn", "vpn"], n_hits=5)
+    assert list(results) == ["vpn"]
+    assert len(results["vpn"]) == 5
+    assert api.api.calls.count(("search", "vpn")) == 1
+
+
+def test_search_many_include_fields_iterator(make_api):
+    api = make_api(cache_ttl=0)
+    results = api.search_many(["vpn", "notes"], n_hits=2, include_fields=iter(["title"]))
+    for apps in results.values():
+        assert [sorted(app) for app in apps] == [["appId", "title"]] * 2
+
+
+def test_cache_disabled_creates_nothing_on_disk(make_api):
+    api = make_api(cache_ttl=0)
+    assert len(api.search("vpn", n_hits=15)) == 15
+    assert len(api.search("vpn", n_hits=15)) == 15
+    assert not os.path.exists(os.path.dirname(gms.MobilePlayAPI.CACHE_PATH))
+    assert api.api.count("search") >= 4
+
+
+def test_expired_rows_purged_on_open(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    cache = gms.ResponseCache(path, ttl=60)
+    cache.set("fresh", {"a": 1})
+    cache.set("stale", {"b": 2}, ttl=-1)
+    assert cache.get("stale") is None
+    cache.close()
+    
+    gms.ResponseCache(path).close()
+    with sqlite3.connect(path) as conn:
+        keys = [row[0] for row in conn.execute("SELECT key FROM cache")]
+    assert keys == ["fresh"]
+
+
+def test_token_bucket_rate_stays_in_bounds():
+    bucket = gms.TokenBucket(rate=2.0, capacity=4, min_rate=0.5, max_rate=3.0)
+    for _ in range(20):
+        bucket.decrease()
+    assert bucket.rate == 0.5
+    for _ in range(100):
+        bucket.increase()
+    assert bucket.rate == 3.0
+    
+    # max_rate defaults to the initial rate
+    bucket = gms.TokenBucket(rate=2.0, capacity=4)
+    bucket.increase()
+    assert bucket.rate == 2.0
+
+
+@pytest.mark.parametrize("status_code, expected", [(429, True), (500, False), (503, False)])
+def test_exhausted_retries_count_only_429(make_api, status_code, expected):
+    requests = pytest.importorskip("requests")
+    from urllib3.exceptions import MaxRetryError, ResponseError
+    
+    reason = ResponseError(ResponseError.SPECIFIC_ERROR.format(status_code=status_code))
+    error = requests.exceptions.RetryError(MaxRetryError(None, "/search", reason))
+    assert make_api()._is_rate_limited(error) is expected